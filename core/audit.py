@@ -0,0 +1,281 @@
+"""
+audit.py — Batch Auditor for the Syzygy Rosetta
+Version: 1.0.0
+Author: Sarasha Elion (Trivian Lineage)
+License: CC BY-NC 4.0
+
+Streams a JSONL transcript of query/response pairs and re-runs the core
+ritual checks (mirror, checksum, evaluate_coherence) on every pair.
+
+Usage:
+    python core/audit.py transcripts.jsonl -o scores.jsonl
+    python core/audit.py dump.jsonl -o scores.parquet --format parquet -j 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from reflex import mirror, checksum, evaluate_coherence
+
+# Configuration
+BATCH_SIZE = 512 # lines handed to a worker at once
+PROGRESS_INTERVAL = 5.0 # seconds between progress reports
+PARQUET_ROW_GROUP = 131072 # rows buffered per Parquet row group
+
+Batch = List[Tuple[int, bytes]]
+
+def audit_record(line_no: int, raw: bytes, query_key: str = "query", response_key: str = "response") -> Dict[str, Any]:
+    """
+    Audit a single transcript line.
+    Warnings printed by evaluate_coherence are captured rather than echoed.
+    """
+    captured = io.StringIO()
+    try:
+        pair = json.loads(raw)
+        query = pair[query_key]
+        response = pair[response_key]
+        if not isinstance(query, str) or not isinstance(response, str):
+            raise TypeError(
+                f"'{query_key}' and '{response_key}' must be strings, "
+                f"got {type(query).__name__} and {type(response).__name__}"
+            )
+
+        mirror_result = mirror(query)
+        with contextlib.redirect_stdout(captured):
+            coherence_score = evaluate_coherence(query, response)
+        response_hash = checksum(response)
+    except Exception as exc:
+        # One bad line (bad JSON, wrong types, unencodable text) must not
+        # abort a run over the whole transcript
+        return {
+            "line": line_no,
+            "input_hash": None,
+            "response_hash": None,
+            "coherence_score": None,
+            "warnings": [],
+            "error": f"{type(exc).__name__}: {exc}"
+        }
+
+    return {
+        "line": line_no,
+        "input_hash": mirror_result["input_hash"][:16],
+        "response_hash": response_hash[:16],
+        "coherence_score": coherence_score,
+        "warnings": [line for line in captured.getvalue().splitlines() if line],
+        "error": None
+    }
+
+def audit_batch(batch: Batch, query_key: str = "query", response_key: str = "response") -> List[Dict[str, Any]]:
+    """
+    Worker entry point: audit every line of a batch, preserving order.
+    """
+    return [audit_record(line_no, raw, query_key, response_key) for line_no, raw in batch]
+
+def read_batches(stream: BinaryIO, batch_size: int = BATCH_SIZE) -> Iterator[Tuple[Batch, int]]:
+    """
+    Lazily group non-blank lines into batches.
+    Yields (batch, bytes_consumed) so callers can report throughput.
+    """
+    batch: Batch = []
+    consumed = 0
+    for line_no, raw in enumerate(stream, 1):
+        consumed += len(raw)
+        if not raw.strip():
+            continue
+        batch.append((line_no, raw))
+        if len(batch) >= batch_size:
+            yield batch, consumed
+            batch, consumed = [], 0
+    if batch or consumed:
+        yield batch, consumed
+
+class JsonlSink:
+    """Write audit records as one JSON object per line."""
+
+    def __init__(self, path: str):
+        self._handle = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            self._handle.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        if self._handle is sys.stdout:
+            self._handle.flush()
+        else:
+            self._handle.close()
+
+class ParquetSink:
+    """
+    Write audit records to a Parquet file. Records are buffered column-wise
+    and written as row groups of `row_group_size` rows, so large audits
+    don't end up with a tiny row group (and a huge footer) per batch.
+    """
+
+    def __init__(self, path: str, row_group_size: int = PARQUET_ROW_GROUP):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from exc
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("line", pa.int64()),
+            ("input_hash", pa.string()),
+            ("response_hash", pa.string()),
+            ("coherence_score", pa.float64()),
+            ("warnings", pa.list_(pa.string())),
+            ("error", pa.string())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self.row_group_size = row_group_size
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self._schema.names}
+        self._buffered = 0
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        for record in records:
+            for name, column in self._columns.items():
+                column.append(record[name])
+        self._buffered += len(records)
+        while self._buffered >= self.row_group_size:
+            self._flush(self.row_group_size)
+
+    def _flush(self, rows: int) -> None:
+        """Write the first `rows` buffered rows as one row group."""
+        if not rows:
+            return
+        head = {name: column[:rows] for name, column in self._columns.items()}
+        self._columns = {name: column[rows:] for name, column in self._columns.items()}
+        self._buffered -= rows
+        table = self._pa.Table.from_pydict(head, schema=self._schema)
+        self._writer.write_table(table, row_group_size=rows)
+
+    def close(self) -> None:
+        self._flush(self._buffered)
+        self._writer.close()
+
+SINKS = {
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink
+}
+
+def report_progress(records: int, warned: int, errors: int, nbytes: int, elapsed: float, final: bool = False) -> None:
+    """
+    Emit a progress line on stderr (stdout may carry the audit output).
+    """
+    elapsed = max(elapsed, 1e-9)
+    label = "AUDIT_COMPLETE" if final else "AUDIT_PROGRESS"
+    print(
+        f"{label}: {records} records ({warned} warned, {errors} errors) | "
+        f"{records / elapsed:.0f} rec/s | {nbytes / elapsed / 1e6:.1f} MB/s | {elapsed:.1f}s",
+        file=sys.stderr,
+        flush=True
+    )
+
+def run_audit(
+    stream: BinaryIO,
+    sink: Any,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    query_key: str = "query",
+    response_key: str = "response",
+    progress_interval: Optional[float] = PROGRESS_INTERVAL
+) -> Dict[str, Any]:
+    """
+    Audit a transcript stream with a process pool.
+    At most ~2 batches per worker are in flight, so memory stays constant
+    regardless of input size; output order matches input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    started = time.monotonic()
+    last_report = started
+    totals = {"records": 0, "warned": 0, "errors": 0, "bytes": 0}
+
+    def drain(future: Any, nbytes: int) -> None:
+        records = future.result()
+        sink.write(records)
+        totals["records"] += len(records)
+        totals["warned"] += sum(1 for r in records if r["warnings"])
+        totals["errors"] += sum(1 for r in records if r["error"])
+        totals["bytes"] += nbytes
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for batch, nbytes in read_batches(stream, batch_size):
+            pending.append((pool.submit(audit_batch, batch, query_key, response_key), nbytes))
+            if len(pending) >= max_pending:
+                drain(*pending.popleft())
+
+            now = time.monotonic()
+            if progress_interval is not None and now - last_report >= progress_interval:
+                report_progress(totals["records"], totals["warned"], totals["errors"], totals["bytes"], now - started)
+                last_report = now
+
+        while pending:
+            drain(*pending.popleft())
+
+    totals["elapsed"] = time.monotonic() - started
+    if progress_interval is not None:
+        report_progress(totals["records"], totals["warned"], totals["errors"], totals["bytes"], totals["elapsed"], final=True)
+    return totals
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="syzygy-audit",
+        description="Re-run mirror, checksum and evaluate_coherence over a JSONL transcript."
+    )
+    parser.add_argument("input", help="JSONL file of query/response pairs ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output path ('-' for stdout, jsonl only)")
+    parser.add_argument("-f", "--format", choices=sorted(SINKS), default="jsonl", help="output format")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="lines per worker task")
+    parser.add_argument("--row-group-size", type=int, default=PARQUET_ROW_GROUP, help="rows per Parquet row group")
+    parser.add_argument("--query-key", default="query", help="JSON field holding the query")
+    parser.add_argument("--response-key", default="response", help="JSON field holding the response")
+    parser.add_argument("--progress-interval", type=float, default=PROGRESS_INTERVAL, help="seconds between progress reports")
+    parser.add_argument("-q", "--quiet", action="store_true", help="suppress progress reporting")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.format == "parquet" and args.output == "-":
+        print("syzygy-audit: parquet output needs a file path (-o)", file=sys.stderr)
+        return 2
+
+    try:
+        if args.format == "parquet":
+            sink = ParquetSink(args.output, row_group_size=args.row_group_size)
+        else:
+            sink = SINKS[args.format](args.output)
+    except RuntimeError as exc:
+        print(f"syzygy-audit: {exc}", file=sys.stderr)
+        return 2
+
+    stream = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    try:
+        run_audit(
+            stream,
+            sink,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            query_key=args.query_key,
+            response_key=args.response_key,
+            progress_interval=None if args.quiet else args.progress_interval
+        )
+    finally:
+        sink.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+"""
+drift.py — Streaming Drift Detection for the Syzygy Rosetta
+Version: 1.0.0
+Author: Sarasha Elion (Trivian Lineage)
+License: CC BY-NC 4.0
+
+Invariant 3: "Pattern-drift is data, not failure."
+Coherence scores are tracked per category (or resonator) with O(1)
+updates and bounded memory. The sliding window is compared against a
+slow reference baseline (mean and spread), and the baseline against an
+anchor fixed at the last note, so both steps and slow ramps surface. A
+field note is emitted only once a shift has held for a full window, so
+it reports the settled magnitude and note volume tracks real drift.
+"""
+import math
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from reflex import field_note
+
+# Configuration
+DRIFT_WINDOW = 50 # scores in the sliding window
+DRIFT_ALPHA = 0.002 # EWMA smoothing for the reference baseline (<< 1/DRIFT_WINDOW)
+DRIFT_Z_THRESHOLD = 3.0 # standard errors before a mean shift counts as drift
+DRIFT_VAR_RATIO = 2.5 # window/baseline variance ratio (or inverse) for a spread shift
+DRIFT_MIN_SHIFT = 0.05 # minimum absolute change in mean or std of coherence
+DRIFT_MIN_VARIANCE = 1e-4 # floor so constant scores don't yield infinite z
+
+
+class P2Quantile:
+    """
+    P² estimator (Jain & Chlamtac, 1985): a single quantile in five markers.
+    Constant memory, O(1) per observation.
+    """
+
+    def __init__(self, p: float = 0.5):
+        self.p = p
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1.0 + 2 * p, 1.0 + 4 * p, 3.0 + 2 * p, 5.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x: float) -> None:
+        h = self._heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+                h[i] = candidate
+                n[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        h = self._heights
+        if not h:
+            return None
+        if len(h) < 5:
+            return h[min(int(self.p * len(h)), len(h) - 1)]
+        return h[2]
+
+
+class CoherenceStream:
+    """
+    Rolling statistics for one category: a slow EWMA reference baseline,
+    a sliding window with running sums, and quantile sketches.
+    The baseline can be frozen while a suspected shift is confirmed, so
+    it does not absorb the very change being measured. The anchor is the
+    baseline mean once it has settled (~1/alpha samples after warmup or a
+    rebaseline); a slow ramp that the EWMA follows still shows up as
+    distance from the anchor.
+    """
+
+    def __init__(self, window: int = DRIFT_WINDOW, alpha: float = DRIFT_ALPHA):
+        self.alpha = alpha
+        self.count = 0
+        self.frozen = False
+        self.baseline_mean = 0.0
+        self.baseline_var = 0.0
+        self._baseline_n = 0
+        self.anchor_mean: Optional[float] = None
+        self.anchor_n = 0
+        self._window: Deque[float] = deque(maxlen=window)
+        self._settle = self._settle_samples()
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self.reset_quantiles()
+
+    def update(self, score: float) -> None:
+        if len(self._window) == self._window.maxlen:
+            old = self._window[0]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._window.append(score)
+        self._sum += score
+        self._sumsq += score * score
+
+        for sketch in self.quantiles.values():
+            sketch.update(score)
+
+        self.count += 1
+        if self.frozen:
+            return
+        # Plain running mean/variance until 1/n drops below alpha
+        self._baseline_n += 1
+        weight = max(self.alpha, 1 / self._baseline_n)
+        delta = score - self.baseline_mean
+        self.baseline_mean += weight * delta
+        self.baseline_var = (1 - weight) * (self.baseline_var + weight * delta * delta)
+
+        if self.anchor_mean is None:
+            self._settle -= 1
+            if self._settle <= 0:
+                self.anchor_mean = self.baseline_mean
+                self.anchor_n = self._baseline_n
+
+    def _settle_samples(self) -> int:
+        return max(int(1 / self.alpha), self._window.maxlen)
+
+    def reset_quantiles(self) -> None:
+        """Start the sketches afresh, e.g. at the onset of a new regime."""
+        self.quantiles = {p: P2Quantile(p) for p in (0.1, 0.5, 0.9)}
+
+    @property
+    def window_full(self) -> bool:
+        return len(self._window) == self._window.maxlen
+
+    @property
+    def window_mean(self) -> float:
+        return self._sum / len(self._window) if self._window else 0.0
+
+    @property
+    def window_var(self) -> float:
+        n = len(self._window)
+        if n < 2:
+            return 0.0
+        return max(self._sumsq / n - self.window_mean ** 2, 0.0)
+
+    def rebaseline(self) -> None:
+        """Adopt the current window as the new reference baseline."""
+        self.baseline_mean = self.window_mean
+        self.baseline_var = self.window_var
+        # Restart as a running mean so the new regime is estimated quickly
+        self._baseline_n = len(self._window)
+        self.anchor_mean = None
+        self._settle = self._settle_samples()
+        self.frozen = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "baseline_mean": round(self.baseline_mean, 4),
+            "baseline_std": round(math.sqrt(self.baseline_var), 4),
+            "anchor_mean": None if self.anchor_mean is None else round(self.anchor_mean, 4),
+            "window_mean": round(self.window_mean, 4),
+            "window_std": round(math.sqrt(self.window_var), 4),
+            "quantiles": {f"p{int(p * 100)}": sketch.value for p, sketch in self.quantiles.items()}
+        }
+
+
+class DriftMonitor:
+    """
+    Track coherence per category and emit a field note on meaningful drift.
+
+    A shift is suspected when the window mean moves by z_threshold standard
+    errors (and min_shift) from the baseline ("mean"), the window variance
+    moves by var_ratio and the std by min_shift ("variance"), or both the
+    baseline and the window have moved min_shift from the anchor in the
+    same direction ("ramp", slow drift the EWMA has followed). The baseline is then frozen
+    and the quantile sketches restart; if the shift still holds a full
+    window later, one note is emitted and the window becomes the new
+    baseline. A shift that fades before then is dropped as noise.
+    """
+
+    def __init__(
+        self,
+        window: int = DRIFT_WINDOW,
+        alpha: float = DRIFT_ALPHA,
+        z_threshold: float = DRIFT_Z_THRESHOLD,
+        var_ratio: float = DRIFT_VAR_RATIO,
+        min_shift: float = DRIFT_MIN_SHIFT,
+        visibility: str = "internal"
+    ):
+        self.window = window
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.var_ratio = var_ratio
+        self.min_shift = min_shift
+        self.visibility = visibility
+        self.streams: Dict[str, CoherenceStream] = {}
+        self._cooldown: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+
+    def _test(self, stream: CoherenceStream) -> Optional[Dict[str, Any]]:
+        """Return the shift statistics if the window departs from baseline or anchor."""
+        baseline_var = max(stream.baseline_var, DRIFT_MIN_VARIANCE)
+        stderr = math.sqrt(baseline_var / self.window)
+        shift = stream.window_mean - stream.baseline_mean
+        z = shift / stderr
+        ratio = max(stream.window_var, DRIFT_MIN_VARIANCE) / baseline_var
+        std_change = math.sqrt(stream.window_var) - math.sqrt(stream.baseline_var)
+        anchor = stream.anchor_mean
+        if anchor is not None:
+            # The anchor is itself an estimate; count its error too
+            anchor_shift = stream.window_mean - anchor
+            anchor_z = anchor_shift / math.sqrt(stderr ** 2 + baseline_var / stream.anchor_n)
+            baseline_drift = stream.baseline_mean - anchor
+
+        kinds = []
+        if abs(shift) >= self.min_shift and abs(z) >= self.z_threshold:
+            kinds.append("mean")
+        if abs(std_change) >= self.min_shift and (ratio >= self.var_ratio or ratio <= 1 / self.var_ratio):
+            kinds.append("variance")
+        if (
+            anchor is not None
+            and abs(baseline_drift) >= self.min_shift
+            and abs(anchor_shift) >= self.min_shift
+            and abs(anchor_z) >= self.z_threshold
+            and baseline_drift * anchor_shift > 0
+        ):
+            kinds.append("ramp")
+        if not kinds:
+            return None
+
+        # Report a ramp against the anchor; otherwise against the baseline
+        if "ramp" in kinds and "mean" not in kinds:
+            return {"kinds": kinds, "reference_mean": anchor, "shift": anchor_shift, "z": anchor_z, "var_ratio": ratio}
+        return {"kinds": kinds, "reference_mean": stream.baseline_mean, "shift": shift, "z": z, "var_ratio": ratio}
+
+    def observe(self, score: float, category: str = "general", emit: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Record a coherence score; return the emitted field note, if any.
+        With emit=False drift is still tracked and rebaselined, but no
+        note is written.
+        """
+        stream = self.streams.get(category)
+        if stream is None:
+            stream = self.streams[category] = CoherenceStream(self.window, self.alpha)
+        stream.update(score)
+
+        cooldown = self._cooldown.get(category, self.window)
+        if cooldown > 0:
+            self._cooldown[category] = cooldown - 1
+            return None
+
+        result = self._test(stream)
+        pending = self._pending.get(category)
+        if result is None:
+            if pending is not None:
+                del self._pending[category]
+                stream.frozen = False
+            return None
+        if pending is None:
+            self._pending[category] = 1
+            stream.frozen = True
+            stream.reset_quantiles()
+            return None
+        if pending < self.window:
+            self._pending[category] = pending + 1
+            return None
+
+        del self._pending[category]
+        stats = stream.snapshot()
+        stream.rebaseline()
+        self._cooldown[category] = self.window
+        if not emit:
+            return None
+
+        note = field_note(
+            f"Coherence drift in '{category}' ({'+'.join(result['kinds'])}): "
+            f"mean {result['reference_mean']:.2f} -> {stats['window_mean']:.2f} (z={result['z']:.1f}), "
+            f"std {stats['baseline_std']:.2f} -> {stats['window_std']:.2f}, "
+            f"p50={stats['quantiles']['p50']:.2f}",
+            category="pattern_drift",
+            visibility=self.visibility
+        )
+        note["drift"] = {
+            "category": category,
+            "kinds": result["kinds"],
+            "reference_mean": round(result["reference_mean"], 4),
+            "shift": round(result["shift"], 4),
+            "z": round(result["z"], 2),
+            "var_ratio": round(result["var_ratio"], 2),
+            **stats
+        }
+        return note
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {category: stream.snapshot() for category, stream in self.streams.items()}
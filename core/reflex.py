@@ -4,17 +4,26 @@ Version: 1.0.0
 Author: Sarasha Elion (Trivian Lineage)
 License: CC BY-NC 4.0
 """
+import ast
+import contextlib
 import hashlib
 import json
 import inspect
 import asyncio
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional, Callable
 from pathlib import Path
 
+from constants import INVARIANTS
+
 # Configuration
 BREATH_INTERVAL = 0.3 # seconds (symbolic for async systems)
 COHERENCE_THRESHOLD = 0.75 # minimum acceptable coherence score
+INVARIANTS_PATH = Path(__file__).with_name("invariants.json")
+
+# self_reflect() cache: path -> ((mtime_ns, size), derived facts)
+_REFLECTION_CACHE: Dict[Path, tuple] = {}
 
 def checksum(text: str, algorithm: str = "sha256") -> str:
     """
@@ -53,6 +62,14 @@ async def breath(duration: float = BREATH_INTERVAL) -> str:
     await asyncio.sleep(duration)
     return "[breath_complete]"
 
+def breath_sync(duration: float = 0.0) -> str:
+    """
+    Synchronous breath for callers outside an event loop.
+    """
+    if duration > 0:
+        time.sleep(duration)
+    return "[breath_initiated]"
+
 def field_note(observation: str, category: str = "general", visibility: str = "internal") -> Dict[str, Any]:
     """
     Emit a Field Note when significant pattern-shift detected.
@@ -73,6 +90,12 @@ def field_note(observation: str, category: str = "general", visibility: str = "i
     print(json.dumps(note))
     return note
 
+def coherence_warning(score: float) -> None:
+    """
+    Announce a coherence score below threshold.
+    """
+    print(f"! COHERENCE WARNING: Score {score:.2f} below threshold")
+
 def evaluate_coherence(input_text: str, response_text: str) -> float:
     """
     Score how well a response maintains coherence with invariants.
@@ -96,39 +119,68 @@ def evaluate_coherence(input_text: str, response_text: str) -> float:
     coherence_score = sum(score_components) / len(score_components)
     
     if coherence_score < COHERENCE_THRESHOLD:
-        print(f"! COHERENCE WARNING: Score {coherence_score:.2f} below threshold")
+        coherence_warning(coherence_score)
         
     return coherence_score
 
-def breath_loop(query: str, process_fn: Callable[[str], str], emit_field_notes: bool = True) -> Dict[str, Any]:
+def _untraced(name: str, **args: Any) -> contextlib.nullcontext:
+    return contextlib.nullcontext()
+
+def breath_loop(
+    query: str,
+    process_fn: Callable[[str], str],
+    emit_field_notes: bool = True,
+    drift_monitor: Optional[Any] = None,
+    category: str = "general",
+    score_cache: Optional[Any] = None,
+    tracer: Optional[Any] = None
+) -> Dict[str, Any]:
     """
     Full ritual: Pause -> Mirror -> Process -> Evaluate Checksum.
     This is the heartbeat of syzygy.
+    Pass a drift.DriftMonitor to track coherence per category, a
+    score_cache.SharedScoreCache to reuse scores across worker processes,
+    and a tracing.Tracer to time each stage.
     """
-    # 1. Pause
-    # Note: Using sync placeholder if not async context, normally await breath()
-    breath_marker = "[breath_initiated]" 
-    
-    # 2. Mirror
-    mirror_result = mirror(query)
-    
-    # 3. Process
-    response = process_fn(query)
-    
-    # 4. Evaluate coherence
-    coherence_score = evaluate_coherence(query, response)
-    
-    # 5. Checksum
-    response_hash = checksum(response)
-    
-    # 6. Field Note
-    field_note_result = None
-    if emit_field_notes and coherence_score >= 0.85:
-        field_note_result = field_note(
-            f"High-coherence interaction (score: {coherence_score:.2f})",
-            category="coherence_success"
-        )
-        
+    span = tracer.span if tracer is not None else _untraced
+
+    with span("breath_loop", category=category):
+        # 1. Pause
+        # Note: Using sync placeholder if not async context, normally await breath()
+        breath_marker = "[breath_initiated]"
+
+        # 2. Mirror
+        with span("mirror"):
+            mirror_result = mirror(query)
+
+        # 3. Process
+        with span("process"):
+            response = process_fn(query)
+
+        # 4-5. Evaluate coherence and checksum (shared across workers if cached)
+        if score_cache is not None:
+            with span("score_cache"):
+                response_hash, coherence_score, _ = score_cache.score(query, response, span=span)
+        else:
+            with span("evaluate_coherence"):
+                coherence_score = evaluate_coherence(query, response)
+            with span("checksum"):
+                response_hash = checksum(response)
+
+        # 6. Field Note
+        field_note_result = None
+        if emit_field_notes and coherence_score >= 0.85:
+            with span("field_note"):
+                field_note_result = field_note(
+                    f"High-coherence interaction (score: {coherence_score:.2f})",
+                    category="coherence_success"
+                )
+
+        drift_note = None
+        if drift_monitor is not None:
+            with span("drift_monitor"):
+                drift_note = drift_monitor.observe(coherence_score, category, emit=emit_field_notes)
+
     return {
         "timestamp": mirror_result["timestamp"],
         "breath": breath_marker,
@@ -136,5 +188,63 @@ def breath_loop(query: str, process_fn: Callable[[str], str], emit_field_notes:
         "response": response,
         "coherence_score": coherence_score,
         "response_hash": response_hash[:16],
-        "field_note": field_note_result
+        "field_note": field_note_result,
+        "drift_note": drift_note
+    }
+
+def _reflect_on(path: Path, derive: Callable[[bytes], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return facts derived from a file, re-reading it only when its
+    (mtime, size) signature changes. A stat() is the steady-state cost.
+    """
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _REFLECTION_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    data = path.read_bytes()
+    facts = derive(data)
+    facts["last_modified"] = datetime.utcfromtimestamp(stat.st_mtime).isoformat() + "Z"
+    _REFLECTION_CACHE[path] = (signature, facts)
+    return facts
+
+def _derive_source_facts(data: bytes) -> Dict[str, Any]:
+    tree = ast.parse(data)
+    function_names = [
+        node.name for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    return {
+        "source_lines": len(data.splitlines()),
+        "function_names": function_names,
+        "integrity_hash": hashlib.sha256(data).hexdigest()[:16]
+    }
+
+def _derive_invariant_facts(data: bytes) -> Dict[str, Any]:
+    return {"invariants_loaded": len(json.loads(data).get("invariants", {}))}
+
+def self_reflect() -> Dict[str, Any]:
+    """
+    Introspect the reflex engine: source size, functions, invariants, integrity.
+    Hashing and parsing are cached per file and redone only on change,
+    so this is cheap enough to back a frequently polled health check.
+    """
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    source = _reflect_on(Path(__file__).resolve(), _derive_source_facts)
+
+    try:
+        invariants_loaded = _reflect_on(INVARIANTS_PATH, _derive_invariant_facts)["invariants_loaded"]
+    except (OSError, ValueError):
+        invariants_loaded = 0
+
+    return {
+        "timestamp": timestamp,
+        "source_lines": source["source_lines"],
+        "function_count": len(source["function_names"]),
+        "function_names": list(source["function_names"]),
+        "invariants_loaded": invariants_loaded,
+        "last_modified": source["last_modified"],
+        "integrity_hash": source["integrity_hash"],
+        "status": "coherent" if invariants_loaded == len(INVARIANTS) else "invariants_incomplete"
     }
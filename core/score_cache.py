@@ -0,0 +1,173 @@
+"""
+score_cache.py — Shared-Memory Score Cache for the Syzygy Rosetta
+Version: 1.0.0
+Author: Sarasha Elion (Trivian Lineage)
+License: CC BY-NC 4.0
+
+A fixed-size, open-addressing hash table in multiprocessing.shared_memory,
+mapping response digest -> (coherence score, flags). Every worker on a
+node can reuse scoring work done by the others, without an external service.
+
+Reads and writes take no lock. Each slot carries a CRC32 of its contents;
+a torn or racing write fails the check and reads as a miss. When a probe
+window is full, the home slot is overwritten—eviction is lossy by design.
+"""
+import struct
+import threading
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Optional, Tuple
+
+from reflex import checksum, coherence_warning, evaluate_coherence, _untraced, COHERENCE_THRESHOLD
+
+# Configuration
+CACHE_SLOTS = 65536 # rounded up to a power of two
+CACHE_PROBES = 8 # linear-probe window before evicting
+
+# Flags
+FLAG_BELOW_THRESHOLD = 0x1
+
+_MAGIC = b"SZSC"
+_HEADER = struct.Struct("<4sIQ") # magic, version, slot count
+_SLOT = struct.Struct("<16sdII") # key, score, flags, crc32
+_PAYLOAD = struct.Struct("<16sdI") # the part covered by the crc
+_EMPTY_KEY = bytes(16)
+_REGISTER_LOCK = threading.Lock()
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach without registering with the resource tracker, so a worker
+    exiting doesn't unlink the segment out from under its siblings.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False) # Python 3.13+
+    except TypeError:
+        pass
+
+    # Unregistering after a normal attach would also drop the creator's
+    # registration when fork-started workers share its tracker. Instead,
+    # skip registering this one segment; other threads' segments created
+    # meanwhile still pass through to the real register().
+    with _REGISTER_LOCK:
+        register = resource_tracker.register
+
+        def register_others(resource_name: str, rtype: str) -> None:
+            if rtype == "shared_memory" and resource_name.lstrip("/") == name.lstrip("/"):
+                return
+            register(resource_name, rtype)
+
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedScoreCache:
+    """
+    Attach to (or create) a named shared-memory score table.
+    The creating process owns the segment and should unlink() it on shutdown.
+    """
+
+    def __init__(self, name: Optional[str] = None, slots: int = CACHE_SLOTS, create: bool = False):
+        if create:
+            slots = 1 << max(slots - 1, 1).bit_length()
+            size = _HEADER.size + slots * _SLOT.size
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+            _HEADER.pack_into(self._shm.buf, 0, _MAGIC, 1, slots)
+        else:
+            if name is None:
+                raise ValueError("name is required when attaching to an existing cache")
+            self._shm = _attach_untracked(name)
+            magic, _version, slots = _HEADER.unpack_from(self._shm.buf, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"shared memory '{name}' is not a score cache")
+
+        self.name = self._shm.name
+        self.slots = slots
+        self._mask = slots - 1
+        self._owner = create
+
+    @staticmethod
+    def _key(digest: str) -> bytes:
+        key = bytes.fromhex(digest[:32])
+        # All-zero is the empty marker; a real digest hitting it is ~2^-128
+        return key if key != _EMPTY_KEY else b"\x01" + key[1:]
+
+    def _offset(self, index: int) -> int:
+        return _HEADER.size + (index & self._mask) * _SLOT.size
+
+    def _read(self, index: int) -> Optional[Tuple[bytes, float, int]]:
+        key, score, flags, crc = _SLOT.unpack_from(self._shm.buf, self._offset(index))
+        if key == _EMPTY_KEY or zlib.crc32(_PAYLOAD.pack(key, score, flags)) != crc:
+            return None
+        return key, score, flags
+
+    def get(self, digest: str) -> Optional[Tuple[float, int]]:
+        """
+        Look up a hex digest; return (score, flags) or None on miss.
+        """
+        key = self._key(digest)
+        home = int.from_bytes(key[:8], "little")
+        for probe in range(CACHE_PROBES):
+            entry = self._read(home + probe)
+            if entry is not None and entry[0] == key:
+                return entry[1], entry[2]
+        return None
+
+    def put(self, digest: str, score: float, flags: int = 0) -> None:
+        """
+        Store a score. Takes the first free or matching slot in the probe
+        window; otherwise evicts whatever sits in the home slot.
+        """
+        key = self._key(digest)
+        home = int.from_bytes(key[:8], "little")
+        target = home
+        for probe in range(CACHE_PROBES):
+            entry = self._read(home + probe)
+            if entry is None or entry[0] == key:
+                target = home + probe
+                break
+
+        crc = zlib.crc32(_PAYLOAD.pack(key, score, flags))
+        _SLOT.pack_into(self._shm.buf, self._offset(target), key, score, flags, crc)
+
+    def score(
+        self,
+        input_text: str,
+        response_text: str,
+        span: Optional[Callable[..., Any]] = None
+    ) -> Tuple[str, float, int]:
+        """
+        Return (response_hash, coherence_score, flags), computing and
+        publishing the score only if no worker has done so already.
+        `span` is an optional tracing.Tracer.span for per-stage timing.
+        """
+        if span is None:
+            span = _untraced
+
+        with span("checksum"):
+            response_hash = checksum(response_text)
+        with span("cache_lookup"):
+            cached = self.get(response_hash)
+        if cached is not None:
+            score, flags = cached
+            if flags & FLAG_BELOW_THRESHOLD:
+                coherence_warning(score)
+            return response_hash, score, flags
+
+        with span("evaluate_coherence"):
+            score = evaluate_coherence(input_text, response_text)
+        flags = FLAG_BELOW_THRESHOLD if score < COHERENCE_THRESHOLD else 0
+        with span("cache_store"):
+            self.put(response_hash, score, flags)
+        return response_hash, score, flags
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if self._owner:
+            self._shm.unlink()
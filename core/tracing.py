@@ -0,0 +1,134 @@
+"""
+tracing.py — Opt-in Ritual Tracing for the Syzygy Rosetta
+Version: 1.0.0
+Author: Sarasha Elion (Trivian Lineage)
+License: CC BY-NC 4.0
+
+Spans around each ritual stage (mirror, process, score, checksum,
+field_note), with sampling of every Nth call and export as Chrome
+trace-event JSON (chrome://tracing, Perfetto, speedscope) or collapsed
+stacks (flamegraph.pl, speedscope).
+
+Usage:
+    tracer = Tracer(sample_every=10)
+    breath_loop(query, process_fn, tracer=tracer)
+    tracer.export("ritual.trace.json")
+    tracer.export("ritual.folded", format="collapsed")
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Tuple
+
+# Configuration
+TRACE_MAX_EVENTS = 100000 # oldest spans are dropped beyond this
+
+
+class SpanEvent(NamedTuple):
+    stack: Tuple[str, ...]
+    start_ns: int
+    duration_ns: int
+    self_ns: int
+    thread_id: int
+    args: Dict[str, Any]
+
+
+class Tracer:
+    """
+    Collect timed spans. The outermost span of a call decides, once,
+    whether the whole call is recorded (every `sample_every`th call).
+    """
+
+    def __init__(self, sample_every: int = 1, max_events: int = TRACE_MAX_EVENTS):
+        if sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.sample_every = sample_every
+        self.events: Deque[SpanEvent] = deque(maxlen=max_events)
+        self._calls = itertools.count()
+        self._origin_ns = time.perf_counter_ns()
+        # Active span stack for the current call, per tracer; None outside
+        # a call, False inside a call this tracer chose not to sample.
+        self._stack: ContextVar = ContextVar(f"syzygy_trace_stack_{id(self):x}", default=None)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        stack = self._stack.get()
+        if stack is False:
+            yield
+            return
+        if stack is None and next(self._calls) % self.sample_every:
+            token = self._stack.set(False)
+            try:
+                yield
+            finally:
+                self._stack.reset(token)
+            return
+
+        # Frames are [name, accumulated child time] so self-time is exact
+        frame = [name, 0]
+        token = self._stack.set((stack or ()) + (frame,))
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self._stack.reset(token)
+            if stack:
+                stack[-1][1] += duration
+            self.events.append(SpanEvent(
+                stack=tuple(f[0] for f in stack or ()) + (name,),
+                start_ns=start - self._origin_ns,
+                duration_ns=duration,
+                self_ns=max(duration - frame[1], 0),
+                thread_id=threading.get_ident(),
+                args=args
+            ))
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace-event JSON: one complete ("X") event per span."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": event.stack[-1],
+                    "cat": "syzygy",
+                    "ph": "X",
+                    "ts": event.start_ns / 1000,
+                    "dur": event.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": event.thread_id,
+                    "args": event.args
+                }
+                for event in self.events
+            ],
+            "displayTimeUnit": "ms"
+        }
+
+    def collapsed(self) -> str:
+        """Collapsed stacks ("a;b;c <self-time µs>"), aggregated per stack."""
+        totals: Dict[Tuple[str, ...], int] = defaultdict(int)
+        for event in self.events:
+            totals[event.stack] += event.self_ns
+        lines: List[str] = [
+            f"{';'.join(stack)} {self_ns // 1000}"
+            for stack, self_ns in sorted(totals.items())
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def export(self, path: str, format: str = "chrome") -> None:
+        if format == "chrome":
+            with open(path, "w", encoding="utf-8") as handle:
+                json.dump(self.chrome_trace(), handle)
+        elif format == "collapsed":
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(self.collapsed())
+        else:
+            raise ValueError(f"unknown trace format: {format!r} (expected 'chrome' or 'collapsed')")
+
+    def clear(self) -> None:
+        self.events.clear()
@@ -0,0 +1,68 @@
+import io
+import json
+
+import pytest
+
+from audit import audit_record, run_audit
+
+
+class ListSink:
+    def __init__(self):
+        self.records = []
+
+    def write(self, records):
+        self.records.extend(records)
+
+    def close(self):
+        pass
+
+
+BAD_LINES = [
+    b"not json\n",
+    b'{"query": null, "response": "x"}\n',
+    b'{"query": "a", "response": 3}\n',
+    b'{"query": "a"}\n',
+    b"[1, 2]\n",
+    b'"just a string"\n',
+    b'{"query": "\\ud800", "response": "ok"}\n',
+    b'{"query": "ok", "response": "\\udfff"}\n',
+]
+GOOD_LINE = json.dumps({"query": "q", "response": "presence mirror coherence"}).encode() + b"\n"
+
+
+def test_surrogate_line_becomes_error_record():
+    record = audit_record(1, b'{"query": "\\ud800", "response": "ok"}')
+
+    assert record["error"].startswith("UnicodeEncodeError")
+    assert record["coherence_score"] is None
+
+
+def test_run_finishes_with_one_error_per_bad_line():
+    stream = io.BytesIO(b"".join([GOOD_LINE] + BAD_LINES + [b"\n", GOOD_LINE]))
+    sink = ListSink()
+
+    totals = run_audit(stream, sink, workers=2, batch_size=3, progress_interval=None)
+
+    assert totals["records"] == len(BAD_LINES) + 2
+    assert totals["errors"] == len(BAD_LINES)
+    assert [r["line"] for r in sink.records] == list(range(1, len(BAD_LINES) + 2)) + [len(BAD_LINES) + 3]
+    errors = [r for r in sink.records if r["error"]]
+    assert [r["line"] for r in errors] == list(range(2, len(BAD_LINES) + 2))
+    assert sink.records[0]["coherence_score"] == 1.0
+    assert sink.records[-1]["error"] is None
+
+
+def test_parquet_buffers_into_large_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from audit import ParquetSink
+
+    path = tmp_path / "scores.parquet"
+    stream = io.BytesIO(GOOD_LINE * 1000 + BAD_LINES[0])
+    sink = ParquetSink(str(path), row_group_size=400)
+
+    run_audit(stream, sink, workers=2, batch_size=32, progress_interval=None)
+    sink.close()
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_rows == 1001
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [400, 400, 201]
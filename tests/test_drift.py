@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from drift import DriftMonitor
+from reflex import breath_loop
+
+
+def observe_all(monitor, scores, category="kaelith"):
+    notes = []
+    for score in scores:
+        note = monitor.observe(score, category)
+        if note is not None:
+            notes.append(note)
+    return notes
+
+
+def baseline(rng, n=2000, mean=0.8, std=0.05):
+    return [rng.gauss(mean, std) for _ in range(n)]
+
+
+@pytest.mark.parametrize("target", [0.7, 0.72, 0.6])
+def test_step_change_emits_one_note_with_full_magnitude(capsys, target):
+    rng = random.Random(7)
+    scores = baseline(rng) + [rng.gauss(target, 0.05) for _ in range(2000)]
+
+    notes = observe_all(DriftMonitor(), scores)
+
+    assert len(notes) == 1
+    drift = notes[0]["drift"]
+    assert "mean" in drift["kinds"]
+    assert drift["baseline_mean"] == pytest.approx(0.8, abs=0.02)
+    assert drift["window_mean"] == pytest.approx(target, abs=0.02)
+    assert drift["shift"] == pytest.approx(target - 0.8, abs=0.03)
+    assert drift["quantiles"]["p50"] == pytest.approx(target, abs=0.03)
+
+
+@pytest.mark.parametrize("length", [5000, 10000, 20000])
+def test_slow_ramp_emits_notes_tracking_total_drift(capsys, length):
+    rng = random.Random(3)
+    ramp = [rng.gauss(0.8 - 0.3 * i / length, 0.05) for i in range(length)]
+    scores = baseline(rng) + ramp + baseline(rng, mean=0.5)
+
+    notes = observe_all(DriftMonitor(), scores)
+
+    assert notes
+    assert all(note["drift"]["shift"] < 0 for note in notes)
+    assert notes[0]["drift"]["reference_mean"] == pytest.approx(0.8, abs=0.02)
+    assert notes[-1]["drift"]["window_mean"] == pytest.approx(0.5, abs=0.06)
+
+
+def test_variance_shift_emits_note(capsys):
+    scores = [0.8] * 2000 + [0.5, 1.1] * 1000
+
+    notes = observe_all(DriftMonitor(), scores)
+
+    assert len(notes) == 1
+    assert notes[0]["drift"]["kinds"] == ["variance"]
+
+
+def test_stationary_stream_is_quiet(capsys):
+    rng = random.Random(11)
+
+    assert observe_all(DriftMonitor(), baseline(rng, n=20000)) == []
+
+
+def test_breath_loop_respects_emit_field_notes(capsys):
+    monitor = DriftMonitor(window=10)
+    responses = iter(["presence mirror coherence"] * 200 + ["leverage"] * 200)
+
+    results = [
+        breath_loop("q", lambda q: next(responses), emit_field_notes=False, drift_monitor=monitor)
+        for _ in range(400)
+    ]
+
+    assert all(result["drift_note"] is None for result in results)
+    assert "pattern_drift" not in capsys.readouterr().out
@@ -0,0 +1,152 @@
+import multiprocessing
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import pytest
+
+from reflex import checksum
+from score_cache import CACHE_PROBES, FLAG_BELOW_THRESHOLD, SharedScoreCache, _SLOT, _attach_untracked
+
+
+@pytest.fixture
+def cache():
+    table = SharedScoreCache(slots=8, create=True)
+    yield table
+    table.close()
+    table.unlink()
+
+
+def digest_with_home(home, salt=""):
+    """Find a digest whose home slot in an 8-slot table is `home`."""
+    i = 0
+    while True:
+        digest = checksum(f"{salt}{i}")
+        if int.from_bytes(bytes.fromhex(digest[:16]), "little") & 7 == home:
+            return digest
+        i += 1
+
+
+def attach_put_and_exit(name, digest):
+    child = SharedScoreCache(name)
+    child.put(digest, 0.25, FLAG_BELOW_THRESHOLD)
+    child.close()
+
+
+def test_put_get_round_trip(cache):
+    digest = checksum("presence")
+
+    assert cache.get(digest) is None
+    cache.put(digest, 0.5, FLAG_BELOW_THRESHOLD)
+    assert cache.get(digest) == (0.5, FLAG_BELOW_THRESHOLD)
+    cache.put(digest, 0.9)
+    assert cache.get(digest) == (0.9, 0)
+
+
+def test_all_zero_digest_is_not_the_empty_marker(cache):
+    digest = "0" * 64
+
+    cache.put(digest, 0.75)
+
+    assert cache.get(digest) == (0.75, 0)
+
+
+def test_probe_wraps_around_end_of_table(cache):
+    first = digest_with_home(7, "a")
+    second = digest_with_home(7, "b")
+
+    cache.put(first, 0.1)
+    cache.put(second, 0.2)
+
+    assert cache.get(first) == (0.1, 0)
+    assert cache.get(second) == (0.2, 0)
+    assert cache._read(0)[0] == bytes.fromhex(second[:32])
+
+
+def test_full_probe_window_evicts_home_slot(cache):
+    assert CACHE_PROBES >= cache.slots
+    digests = [checksum(str(i)) for i in range(cache.slots)]
+    for i, digest in enumerate(digests):
+        cache.put(digest, i / 10)
+    assert all(cache.get(digest) is not None for digest in digests)
+
+    newcomer = digest_with_home(0, "new")
+    cache.put(newcomer, 0.99)
+
+    assert cache.get(newcomer) == (0.99, 0)
+    assert sum(cache.get(digest) is not None for digest in digests) == cache.slots - 1
+
+
+def test_corrupted_slot_reads_as_miss(cache):
+    digest = digest_with_home(3)
+    cache.put(digest, 0.5)
+    offset = cache._offset(3) + 16 # first byte of the score
+
+    cache._shm.buf[offset] ^= 0xFF
+
+    assert cache.get(digest) is None
+    cache.put(digest, 0.5)
+    assert cache.get(digest) == (0.5, 0)
+
+
+def test_attached_handle_close_keeps_segment(cache):
+    digest = checksum("shared")
+    other = SharedScoreCache(cache.name)
+    other.put(digest, 0.4)
+    other.close()
+    other.unlink() # not the owner: no-op
+
+    assert cache.get(digest) == (0.4, 0)
+    again = SharedScoreCache(cache.name)
+    assert again.get(digest) == (0.4, 0)
+    again.close()
+
+
+def test_spawned_worker_exit_keeps_segment(cache):
+    digest = checksum("from a worker")
+    worker = multiprocessing.get_context("spawn").Process(target=attach_put_and_exit, args=(cache.name, digest))
+    worker.start()
+    worker.join(timeout=30)
+
+    assert worker.exitcode == 0
+    assert cache.get(digest) == (0.25, FLAG_BELOW_THRESHOLD)
+    again = SharedScoreCache(cache.name)
+    assert again.get(digest) == (0.25, FLAG_BELOW_THRESHOLD)
+    again.close()
+
+
+def test_attach_only_skips_registering_its_own_segment(cache, monkeypatch):
+    registered = []
+    monkeypatch.setattr(resource_tracker, "register", lambda name, rtype: registered.append(name))
+    real = shared_memory.SharedMemory
+
+    def attach_while_another_thread_registers(*args, **kwargs):
+        resource_tracker.register("/psm_other_thread", "shared_memory")
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", attach_while_another_thread_registers)
+
+    _attach_untracked(cache.name).close()
+
+    assert "/psm_other_thread" in registered
+    assert all(name.lstrip("/") != cache.name.lstrip("/") for name in registered)
+
+
+def test_attach_is_thread_safe(cache):
+    original = resource_tracker.register
+    errors = []
+
+    def attach():
+        try:
+            for _ in range(50):
+                SharedScoreCache(cache.name).close()
+        except Exception as exc: # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=attach) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert resource_tracker.register is original
@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+
+from reflex import breath_loop
+from score_cache import SharedScoreCache
+from tracing import Tracer
+
+
+def run_calls(tracer, calls, name="call"):
+    for i in range(calls):
+        with tracer.span(name, index=i):
+            with tracer.span("child"):
+                pass
+
+
+def test_sample_every_records_calls_0_n_2n():
+    tracer = Tracer(sample_every=3)
+
+    run_calls(tracer, 10)
+
+    roots = [event for event in tracer.events if event.stack == ("call",)]
+    assert [event.args["index"] for event in roots] == [0, 3, 6, 9]
+    assert sum(event.stack == ("call", "child") for event in tracer.events) == 4
+
+
+def test_nesting_and_self_time():
+    tracer = Tracer()
+
+    with tracer.span("outer"):
+        time.sleep(0.01)
+        with tracer.span("inner"):
+            time.sleep(0.02)
+
+    inner, outer = tracer.events
+    assert inner.stack == ("outer", "inner")
+    assert outer.stack == ("outer",)
+    assert inner.self_ns == inner.duration_ns
+    assert outer.self_ns == outer.duration_ns - inner.duration_ns
+    assert outer.self_ns >= 10_000_000
+    assert inner.duration_ns >= 20_000_000
+
+
+def test_tracers_are_isolated():
+    sampled_out = Tracer(sample_every=2)
+    always = Tracer()
+
+    for _ in range(4):
+        with sampled_out.span("a"):
+            with always.span("b"):
+                with sampled_out.span("a_child"):
+                    pass
+
+    assert len(always.events) == 4
+    assert {event.stack for event in always.events} == {("b",)}
+    assert [event.stack for event in sampled_out.events] == [("a", "a_child"), ("a",)] * 2
+
+
+def test_chrome_export(tmp_path):
+    tracer = Tracer()
+    run_calls(tracer, 2)
+    path = tmp_path / "trace.json"
+
+    tracer.export(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["child", "call", "child", "call"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert events[1]["ts"] <= events[0]["ts"]
+    assert events[1]["args"] == {"index": 0}
+
+
+def test_collapsed_export(tmp_path):
+    tracer = Tracer()
+    run_calls(tracer, 3)
+    path = tmp_path / "trace.folded"
+
+    tracer.export(str(path), format="collapsed")
+
+    lines = path.read_text().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["call", "call;child"]
+    assert all(int(line.rsplit(" ", 1)[1]) >= 0 for line in lines)
+
+
+def test_unknown_format_and_bad_sampling_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Tracer().export(str(tmp_path / "x"), format="svg")
+    with pytest.raises(ValueError):
+        Tracer(sample_every=0)
+
+
+def test_breath_loop_spans_with_score_cache(capsys):
+    tracer = Tracer()
+    cache = SharedScoreCache(slots=8, create=True)
+    try:
+        breath_loop("q", lambda q: "presence mirror coherence", tracer=tracer, score_cache=cache)
+    finally:
+        cache.close()
+        cache.unlink()
+
+    stacks = {event.stack for event in tracer.events}
+    assert ("breath_loop", "score_cache", "checksum") in stacks
+    assert ("breath_loop", "score_cache", "cache_lookup") in stacks
+    assert ("breath_loop", "score_cache", "evaluate_coherence") in stacks
+    assert ("breath_loop", "process") in stacks